@@ -10,14 +10,19 @@ import time
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
-from rich.live import Live
-from rich.panel import Panel
 from rich.text import Text
-from rich.progress import Progress
-from network_sniffer import NetworkSniffer
+from config import ensure_valid
 
 console = Console()
 
+# Color coding for protocols in the packet table
+PROTOCOL_STYLES = {
+    'TCP': 'bold blue',
+    'UDP': 'bold red',
+    'ICMP': 'bold yellow',
+    'ARP': 'bold magenta'
+}
+
 def print_banner():
     """Print application banner"""
     banner = """
@@ -68,12 +73,15 @@ def list_interfaces(sniffer):
     console.print(table)
     return True
 
-def create_stats_table(stats):
-    """Create a rich table for statistics"""
+def new_stats_table():
+    """Create an empty rich table for statistics"""
     table = Table(title="Packet Statistics", show_header=True, header_style="bold magenta")
     table.add_column("Metric", style="cyan")
     table.add_column("Value", style="green")
-    
+    return table
+
+def add_stats_rows(table, stats):
+    """Fill an empty statistics table"""
     if stats:
         table.add_row("Total Packets", str(stats.get('total_packets', 0)))
         table.add_row("Protocols Detected", str(len(stats.get('protocols', {}))))
@@ -87,43 +95,62 @@ def create_stats_table(stats):
     
     return table
 
-def create_packet_table(packets):
-    """Create a rich table for recent packets"""
+def create_stats_table(stats):
+    """Create a rich table for statistics"""
+    return add_stats_rows(new_stats_table(), stats)
+
+def format_packet_time(timestamp):
+    """Format a packet timestamp (epoch seconds or ISO string) as HH:MM:SS"""
+    if isinstance(timestamp, (int, float)):
+        return datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')
+    return datetime.fromisoformat(timestamp).strftime('%H:%M:%S')
+
+def truncate(value, width=18):
+    """Shorten a table cell value, appending '...' when it is cut"""
+    return value if len(value) <= width else value[:width] + '...'
+
+def new_packet_table():
+    """Create an empty rich table for recent packets"""
     table = Table(title="Recent Packets", show_header=True, header_style="bold magenta")
     table.add_column("Time", style="cyan", width=12)
     table.add_column("Protocol", style="green", width=8)
     table.add_column("Source", style="yellow", width=20)
     table.add_column("Destination", style="yellow", width=20)
     table.add_column("Length", style="blue", width=10)
-    
+    return table
+
+def add_packet_rows(table, packets):
+    """Fill an empty recent packets table"""
     for packet in packets[-10:]:  # Show last 10 packets
-        time_str = datetime.fromisoformat(packet['timestamp']).strftime('%H:%M:%S')
+        time_str = format_packet_time(packet['timestamp'])
         protocol = packet.get('protocol', 'Unknown')
         src = packet.get('src_ip', packet.get('src_mac', 'Unknown'))
         dst = packet.get('dst_ip', packet.get('dst_mac', 'Unknown'))
         length = packet.get('length', 0)
         
-        # Color code protocols
-        protocol_style = {
-            'TCP': 'bold blue',
-            'UDP': 'bold red',
-            'ICMP': 'bold yellow',
-            'ARP': 'bold magenta'
-        }.get(protocol, 'bold white')
-        
         table.add_row(
             time_str,
-            Text(protocol, style=protocol_style),
-            src[:18] + '...' if len(src) > 18 else src,
-            dst[:18] + '...' if len(dst) > 18 else dst,
+            Text(protocol, style=PROTOCOL_STYLES.get(protocol, 'bold white')),
+            truncate(src),
+            truncate(dst),
             f"{length} bytes"
         )
     
     return table
 
-def live_capture(interface, filter_str="", max_packets=1000):
+def create_packet_table(packets):
+    """Create a rich table for recent packets"""
+    return add_packet_rows(new_packet_table(), packets)
+
+def live_capture(interface, filter_str="", max_packets=1000, sniffer=None):
     """Live packet capture with real-time display"""
-    sniffer = NetworkSniffer()
+    # Only needed for live capture, so keep them off the --help/--list path
+    from rich.live import Live
+    from rich.layout import Layout
+    
+    if sniffer is None:
+        from network_sniffer import NetworkSniffer
+        sniffer = NetworkSniffer()
     
     console.print(f"\n[bold green]Starting capture on interface:[/bold green] {interface}")
     if filter_str:
@@ -137,26 +164,32 @@ def live_capture(interface, filter_str="", max_packets=1000):
     console.print("\n[bold]Press Ctrl+C to stop capture[/bold]\n")
     
     try:
-        with Live(auto_refresh=True, refresh_per_second=4) as live:
+        # The layout is built once and each tick swaps in fresh tables, as rich
+        # has no public API for clearing rows. It fills the terminal exactly;
+        # any border around it would push the frame past the console height
+        layout = Layout()
+        layout.split_column(
+            Layout(name="status", size=1),
+            Layout(name="stats", size=10),
+            Layout(name="packets")
+        )
+        
+        # Refresh manually so rows are never rendered half-updated
+        with Live(layout, auto_refresh=False) as live:
             while True:
                 # Get current stats and packets
                 stats = sniffer.get_packet_stats()
                 packets = sniffer.get_recent_packets(10)
                 
-                # Create layout
-                stats_table = create_stats_table(stats)
-                packet_table = create_packet_table(packets)
+                layout["stats"].update(create_stats_table(stats))
+                layout["packets"].update(create_packet_table(packets))
                 
-                # Combine tables
-                layout = f"{stats_table}\n\n{packet_table}"
-                
-                # Add status panel
+                # Status line above the tables
                 status = f"Capturing: {'[green]ACTIVE[/green]' if sniffer.is_capturing else '[red]STOPPED[/red]'}"
                 status += f" | Packets: {sniffer.packet_count}"
                 status += f" | Interface: {interface}"
-                
-                panel = Panel(layout, title=status, border_style="blue")
-                live.update(panel)
+                layout["status"].update(Text.from_markup(status, style="bold blue"))
+                live.refresh()
                 
                 time.sleep(0.25)  # Update 4 times per second
                 
@@ -179,8 +212,8 @@ def live_capture(interface, filter_str="", max_packets=1000):
                 else:
                     console.print("[red]Export failed![/red]")
 
-def main():
-    """Main function"""
+def main(argv=None):
+    """Main function (argv defaults to sys.argv[1:])"""
     parser = argparse.ArgumentParser(
         description="Network Sniffer CLI - Real-time packet analyzer",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -219,12 +252,19 @@ Examples:
         help='Maximum packets to store in memory (default: 1000)'
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Print banner
     print_banner()
     
-    # Create sniffer instance
+    # Validate configuration (errors are printed by ensure_valid)
+    try:
+        ensure_valid()
+    except ValueError:
+        sys.exit(1)
+    
+    # Create sniffer instance (imported here so --help doesn't load scapy)
+    from network_sniffer import NetworkSniffer
     sniffer = NetworkSniffer()
     
     # List interfaces if requested
@@ -251,7 +291,7 @@ Examples:
     
     # Start live capture
     try:
-        live_capture(args.interface, args.filter, args.max_packets)
+        live_capture(args.interface, args.filter, args.max_packets, sniffer)
     except Exception as e:
         console.print(f"[red]Error during capture: {e}[/red]")
         sys.exit(1)
@@ -43,6 +43,7 @@ CORS_ALLOWED_ORIGINS = "*"
 WEBSOCKET_PING_INTERVAL = 25
 WEBSOCKET_PING_TIMEOUT = 10
 BACKGROUND_TASK_INTERVAL = 1  # seconds
+SOCKETIO_ASYNC_MODE = "threading"  # or "eventlet"/"gevent" (start.py monkey-patches for these)
 
 # Demo mode settings
 DEMO_PACKET_INTERVAL_MIN = 0.1  # seconds
@@ -96,24 +97,51 @@ def validate_config():
     if PACKET_CAPTURE_TIMEOUT < 1:
         errors.append("PACKET_CAPTURE_TIMEOUT must be at least 1 second")
     
+    if SOCKETIO_ASYNC_MODE not in ("threading", "eventlet", "gevent"):
+        errors.append("SOCKETIO_ASYNC_MODE must be threading, eventlet or gevent")
+    
     return errors
 
 def load_from_env():
     """Load configuration from environment variables"""
-    global WEB_PORT, DEMO_PORT, DEBUG_MODE, MAX_PACKETS_IN_MEMORY
+    global WEB_PORT, DEMO_PORT, DEBUG_MODE, MAX_PACKETS_IN_MEMORY, SOCKETIO_ASYNC_MODE
     
     WEB_PORT = int(os.getenv('WEB_PORT', WEB_PORT))
     DEMO_PORT = int(os.getenv('DEMO_PORT', DEMO_PORT))
     DEBUG_MODE = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
     MAX_PACKETS_IN_MEMORY = int(os.getenv('MAX_PACKETS_IN_MEMORY', MAX_PACKETS_IN_MEMORY))
-
-# Load environment variables
-load_from_env()
-
-# Validate configuration
-config_errors = validate_config()
-if config_errors:
-    print("Configuration errors:")
-    for error in config_errors:
-        print(f"  - {error}")
-    raise ValueError("Invalid configuration") 
\ No newline at end of file
+    SOCKETIO_ASYNC_MODE = os.getenv('SOCKETIO_ASYNC_MODE', SOCKETIO_ASYNC_MODE)
+
+def apply_async_mode():
+    """Monkey-patch the standard library for eventlet/gevent (call before other imports)"""
+    global _async_mode_applied
+    if _async_mode_applied:
+        return
+    if SOCKETIO_ASYNC_MODE == "eventlet":
+        import eventlet
+        eventlet.monkey_patch()
+    elif SOCKETIO_ASYNC_MODE == "gevent":
+        from gevent import monkey
+        monkey.patch_all()
+    _async_mode_applied = True
+
+def ensure_valid():
+    """Validate configuration once per process, raising ValueError on errors"""
+    global _validated
+    if _validated:
+        return
+    
+    config_errors = validate_config()
+    if config_errors:
+        print("Configuration errors:")
+        for error in config_errors:
+            print(f"  - {error}")
+        raise ValueError("Invalid configuration")
+    _validated = True
+
+# Load environment variables (cheap, and importers need the final values).
+# Validation is left to the entry points and to modules that size buffers at
+# import, via ensure_valid().
+_validated = False
+_async_mode_applied = False
+load_from_env()
\ No newline at end of file
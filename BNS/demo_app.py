@@ -4,18 +4,26 @@ Demo Network Sniffer Web Application
 Flask-based web interface using simulated packet data for testing.
 """
 
+if __name__ == '__main__':
+    # Run directly: eventlet/gevent must patch the standard library before the imports below
+    from config import apply_async_mode
+    apply_async_mode()
+
 from flask import Flask, render_template, jsonify, request, send_file
 from flask_socketio import SocketIO, emit
-import threading
-import time
 import json
 import os
 from datetime import datetime
 from demo_sniffer import DemoNetworkSniffer
+from json_utils import SocketIOJSON
+from config import ensure_valid, SOCKETIO_ASYNC_MODE
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'demo_network_sniffer_secret_key'
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", json=SocketIOJSON, async_mode=SOCKETIO_ASYNC_MODE)
+
+# Reject bad settings before MAX_PACKETS_IN_MEMORY sizes the sniffer buffer
+ensure_valid()
 
 # Global demo sniffer instance
 sniffer = DemoNetworkSniffer()
@@ -99,22 +107,28 @@ def export_packets():
 
 def background_packet_emitter():
     """Background thread to emit packet updates via WebSocket"""
+    last_packet_count = None
+    last_seq = 0
     while True:
+        # Sleep until the capture thread reports new packets
+        if not sniffer.wait_for_packets(timeout=1.0):
+            continue
+        
         if sniffer.is_capturing:
             try:
-                # Get new packets from queue
-                while not sniffer.packet_queue.empty():
-                    packet = sniffer.packet_queue.get_nowait()
-                    socketio.emit('new_packet', packet)
+                # Send packets stored since the last wakeup as a single batch
+                last_seq, batch = sniffer.get_packets_since(last_seq)
+                if batch:
+                    socketio.emit('new_packets', batch)
                 
-                # Emit stats periodically
-                stats = sniffer.get_packet_stats()
-                socketio.emit('stats_update', stats)
+                # Emit stats only when new packets have arrived
+                if sniffer.packet_count != last_packet_count:
+                    last_packet_count = sniffer.packet_count
+                    stats = sniffer.get_packet_stats()
+                    socketio.emit('stats_update', stats)
                 
             except Exception as e:
                 print(f"Background emitter error: {e}")
-        
-        time.sleep(0.1)  # 100ms delay
 
 @socketio.on('connect')
 def handle_connect():
@@ -132,9 +146,8 @@ def handle_disconnect():
     print('Demo client disconnected')
 
 if __name__ == '__main__':
-    # Start background thread for packet emission
-    background_thread = threading.Thread(target=background_packet_emitter, daemon=True)
-    background_thread.start()
+    # Start background task for packet emission (a green thread under eventlet/gevent)
+    socketio.start_background_task(background_packet_emitter)
     
     print("Demo Network Sniffer Web Application")
     print("Starting server on http://localhost:5001")
@@ -7,14 +7,43 @@ A demonstration version that generates simulated packet data for testing the int
 import time
 import threading
 import random
-import json
 from datetime import datetime, timedelta
-from queue import Queue
+from typing import NamedTuple, Optional
+from json_utils import dump_json
+from packet_store import PacketStore
+from config import MAX_PACKETS_IN_MEMORY, DEMO_PACKET_INTERVAL_MIN, DEMO_PACKET_INTERVAL_MAX
+
+# Mean packet rate matches the configured random interval between packets
+DEMO_PACKET_RATE = 2.0 / (DEMO_PACKET_INTERVAL_MIN + DEMO_PACKET_INTERVAL_MAX)  # packets/second
+DEMO_TICK_INTERVAL = 1.0  # seconds
+
+# Value pools for simulated packets, built once instead of per packet
+DEMO_PROTOCOLS = ('TCP', 'UDP', 'ICMP', 'HTTP', 'HTTPS', 'DNS')
+DEMO_TCP_FLAGS = ('SYN', 'ACK', 'FIN', 'RST')
+DEMO_SRC_IPS = tuple(f"192.168.1.{i}" for i in range(1, 255))
+DEMO_DST_IPS = tuple(f"10.0.0.{i}" for i in range(1, 255))
+DEMO_SRC_PORTS = range(1024, 65536)
+DEMO_DST_PORTS = range(1, 1025)
+DEMO_LENGTHS = range(64, 1501)
+
+class DemoPacket(NamedTuple):
+    """A simulated packet as stored in the demo buffer"""
+    timestamp: float
+    length: int
+    protocol: str
+    src_ip: str
+    dst_ip: str
+    src_port: Optional[int]
+    dst_port: Optional[int]
+    flags: Optional[str]
+    payload: Optional[str] = None
 
 class DemoNetworkSniffer:
     def __init__(self):
-        self.packets = []
-        self.packet_queue = Queue()
+        self._store = PacketStore(MAX_PACKETS_IN_MEMORY)
+        self.packets = self._store.packets
+        self._rng = random.Random()  # Per-instance generator instead of the shared module one
+        self._new_packets = threading.Event()
         self.is_capturing = False
         self.capture_thread = None
         self.packet_count = 0
@@ -29,52 +58,63 @@ class DemoNetworkSniffer:
         """Get detailed information about a network interface"""
         return {
             'name': interface,
-            'mac': f"00:1A:2B:3C:4D:{random.randint(10, 99):02d}",
-            'ip': f"192.168.1.{random.randint(1, 254)}",
+            'mac': f"00:1A:2B:3C:4D:{self._rng.randint(10, 99):02d}",
+            'ip': f"192.168.1.{self._rng.randint(1, 254)}",
             'netmask': "255.255.255.0"
         }
     
     def generate_demo_packet(self):
         """Generate a simulated packet"""
-        protocols = ['TCP', 'UDP', 'ICMP', 'HTTP', 'HTTPS', 'DNS']
-        protocol = random.choice(protocols)
+        choice = self._rng.choice
+        protocol = choice(DEMO_PROTOCOLS)
         
-        # Generate random IP addresses
-        src_ip = f"192.168.1.{random.randint(1, 254)}"
-        dst_ip = f"10.0.0.{random.randint(1, 254)}"
+        # Pick random IP addresses from the prebuilt pools
+        src_ip = choice(DEMO_SRC_IPS)
+        dst_ip = choice(DEMO_DST_IPS)
         
         # Generate random ports for TCP/UDP
-        src_port = random.randint(1024, 65535) if protocol in ['TCP', 'UDP'] else None
-        dst_port = random.randint(1, 1024) if protocol in ['TCP', 'UDP'] else None
+        has_ports = protocol == 'TCP' or protocol == 'UDP'
+        src_port = choice(DEMO_SRC_PORTS) if has_ports else None
+        dst_port = choice(DEMO_DST_PORTS) if has_ports else None
         
-        packet_info = {
-            'timestamp': datetime.now().isoformat(),
-            'length': random.randint(64, 1500),
-            'protocol': protocol,
-            'src_ip': src_ip,
-            'dst_ip': dst_ip,
-            'src_port': src_port,
-            'dst_port': dst_port,
-            'flags': random.choice(['SYN', 'ACK', 'FIN', 'RST']) if protocol == 'TCP' else None,
-            'payload': None,
-            'summary': f"{protocol} {src_ip}:{src_port or 'N/A'} -> {dst_ip}:{dst_port or 'N/A'}"
-        }
+        packet_info = DemoPacket(
+            timestamp=time.time(),
+            length=choice(DEMO_LENGTHS),
+            protocol=protocol,
+            src_ip=src_ip,
+            dst_ip=dst_ip,
+            src_port=src_port,
+            dst_port=dst_port,
+            flags=choice(DEMO_TCP_FLAGS) if protocol == 'TCP' else None
+        )
         
         return packet_info
     
+    @staticmethod
+    def _with_summary(packet):
+        """Packet as a dict with its display summary, built only for packets being returned"""
+        summary = (f"{packet.protocol} {packet.src_ip}:{packet.src_port or 'N/A'} -> "
+                   f"{packet.dst_ip}:{packet.dst_port or 'N/A'}")
+        return {**packet._asdict(), 'summary': summary}
+    
     def packet_callback(self):
         """Simulate packet callback"""
         if not self.is_capturing:
             return
             
-        packet_info = self.generate_demo_packet()
-        self.packets.append(packet_info)
-        self.packet_queue.put(packet_info)
+        self._store.add(self.generate_demo_packet())
         self.packet_count += 1
-        
-        # Keep only last 1000 packets in memory
-        if len(self.packets) > 1000:
-            self.packets.pop(0)
+        self._new_packets.set()
+    
+    def _packets_per_tick(self):
+        """Number of packet arrivals in one tick of a Poisson process at DEMO_PACKET_RATE"""
+        expovariate = self._rng.expovariate
+        count = 0
+        elapsed = expovariate(DEMO_PACKET_RATE)
+        while elapsed < DEMO_TICK_INTERVAL:
+            count += 1
+            elapsed += expovariate(DEMO_PACKET_RATE)
+        return count
     
     def start_capture(self, interface=None, filter_str=""):
         """Start simulated packet capture"""
@@ -89,9 +129,11 @@ class DemoNetworkSniffer:
         def capture_packets():
             try:
                 while self.is_capturing:
-                    self.packet_callback()
-                    # Generate packets at random intervals
-                    time.sleep(random.uniform(0.1, 2.0))
+                    # Generate a Poisson-sized batch once per tick rather than
+                    # sleeping between every packet
+                    for _ in range(self._packets_per_tick()):
+                        self.packet_callback()
+                    time.sleep(DEMO_TICK_INTERVAL)
             except Exception as e:
                 print(f"Demo capture error: {e}")
         
@@ -108,49 +150,38 @@ class DemoNetworkSniffer:
     
     def get_packet_stats(self):
         """Get statistics about captured packets"""
-        if not self.packets:
-            return {}
-        
-        protocols = {}
-        ips = {}
-        ports = {}
-        
-        for packet in self.packets:
-            # Protocol stats
-            protocol = packet.get('protocol', 'Unknown')
-            protocols[protocol] = protocols.get(protocol, 0) + 1
-            
-            # IP stats
-            src_ip = packet.get('src_ip', 'Unknown')
-            if src_ip != 'Unknown':
-                ips[src_ip] = ips.get(src_ip, 0) + 1
-            
-            # Port stats
-            src_port = packet.get('src_port')
-            if src_port:
-                ports[src_port] = ports.get(src_port, 0) + 1
-        
-        return {
-            'total_packets': len(self.packets),
-            'protocols': protocols,
-            'top_ips': dict(sorted(ips.items(), key=lambda x: x[1], reverse=True)[:10]),
-            'top_ports': dict(sorted(ports.items(), key=lambda x: x[1], reverse=True)[:10])
-        }
+        return self._store.stats()
     
     def get_recent_packets(self, count=50):
         """Get the most recent packets"""
-        return self.packets[-count:] if self.packets else []
+        return [self._with_summary(packet) for packet in self._store.recent(count)]
+    
+    def wait_for_packets(self, timeout=None):
+        """Block until new packets are stored; returns False on timeout"""
+        if self._new_packets.wait(timeout):
+            self._new_packets.clear()
+            return True
+        return False
+    
+    def get_packets_since(self, seq):
+        """Get packets stored after sequence number seq, plus the current sequence number"""
+        seq, batch = self._store.since(seq)
+        return seq, [self._with_summary(packet) for packet in batch]
     
     def clear_packets(self):
         """Clear all stored packets"""
-        self.packets.clear()
+        self._store.clear()
         self.packet_count = 0
     
     def export_packets(self, filename):
         """Export captured packets to a file"""
         try:
-            with open(filename, 'w') as f:
-                json.dump(self.packets, f, indent=2)
+            packets = self._store.snapshot()
+            # Timestamps are kept as epoch floats; only format them for export
+            packets = [{**self._with_summary(packet),
+                        'timestamp': datetime.fromtimestamp(packet.timestamp).isoformat()}
+                       for packet in packets]
+            dump_json(packets, filename)
             return True
         except Exception as e:
             print(f"Export error: {e}")
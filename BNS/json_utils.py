@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+JSON helpers for Network Sniffer
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dump_json(data, filename):
+    """Write data to filename as indented JSON"""
+    # Packet fields are plain JSON types; default=str only keeps an unexpected
+    # value from failing the whole export
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
+
+class SocketIOJSON:
+    """json module replacement for Flask-SocketIO packet encoding"""
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        # default=str, as in dump_json, for any value that is not a plain JSON type
+        if orjson is None:
+            kwargs.setdefault('default', str)
+            return json.dumps(obj, *args, **kwargs)
+        # Stats use integer port numbers as keys
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        if orjson is None:
+            return json.loads(s, *args, **kwargs)
+        return orjson.loads(s)
@@ -6,10 +6,14 @@ Provides centralized logging functionality.
 
 import logging
 import sys
+from logging.handlers import RotatingFileHandler
 from datetime import datetime
 from pathlib import Path
 from config import LOG_LEVEL, LOG_FILE
 
+LOG_MAX_BYTES = 10 * 1024 * 1024  # rotate the log file at 10 MB
+LOG_BACKUP_COUNT = 3
+
 def setup_logger(name="network_sniffer", level=None):
     """Setup and configure logger"""
     if level is None:
@@ -19,8 +23,9 @@ def setup_logger(name="network_sniffer", level=None):
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
-    # Clear existing handlers
-    logger.handlers.clear()
+    # Already configured (e.g. module imported again) - keep existing handlers
+    if logger.handlers:
+        return logger
     
     # Create formatters
     detailed_formatter = logging.Formatter(
@@ -41,51 +46,51 @@ def setup_logger(name="network_sniffer", level=None):
         log_path = Path(LOG_FILE)
         log_path.parent.mkdir(exist_ok=True)
         
-        file_handler = logging.FileHandler(log_path)
+        file_handler = RotatingFileHandler(log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
         file_handler.setLevel(level)
         file_handler.setFormatter(detailed_formatter)
         logger.addHandler(file_handler)
     except Exception as e:
-        logger.warning(f"Could not setup file logging: {e}")
+        logger.warning("Could not setup file logging: %s", e)
     
     return logger
 
 def log_packet_capture(logger, interface, filter_str, packet_count):
     """Log packet capture events"""
-    logger.info(f"Packet capture started - Interface: {interface}, Filter: '{filter_str}', Packets: {packet_count}")
+    logger.info("Packet capture started - Interface: %s, Filter: '%s', Packets: %s", interface, filter_str, packet_count)
 
 def log_error(logger, error, context=""):
     """Log errors with context"""
     if context:
-        logger.error(f"{context}: {error}")
+        logger.error("%s: %s", context, error)
     else:
-        logger.error(f"Error: {error}")
+        logger.error("Error: %s", error)
 
 def log_performance(logger, operation, duration):
     """Log performance metrics"""
-    logger.info(f"Performance - {operation}: {duration:.3f}s")
+    logger.info("Performance - %s: %.3fs", operation, duration)
 
 def log_security(logger, event, details=""):
     """Log security-related events"""
     if details:
-        logger.warning(f"Security - {event}: {details}")
+        logger.warning("Security - %s: %s", event, details)
     else:
-        logger.warning(f"Security - {event}")
+        logger.warning("Security - %s", event)
 
 def log_interface_detection(logger, interfaces_found, method_used):
     """Log interface detection results"""
-    logger.info(f"Interface detection - Found {len(interfaces_found)} interfaces using {method_used}")
+    logger.info("Interface detection - Found %d interfaces using %s", len(interfaces_found), method_used)
 
 def log_web_request(logger, endpoint, status_code, duration=None):
     """Log web interface requests"""
     if duration:
-        logger.info(f"Web request - {endpoint}: {status_code} ({duration:.3f}s)")
+        logger.info("Web request - %s: %s (%.3fs)", endpoint, status_code, duration)
     else:
-        logger.info(f"Web request - {endpoint}: {status_code}")
+        logger.info("Web request - %s: %s", endpoint, status_code)
 
 def log_export(logger, filename, packet_count):
     """Log export operations"""
-    logger.info(f"Export - {filename}: {packet_count} packets exported")
+    logger.info("Export - %s: %s packets exported", filename, packet_count)
 
 def log_demo_mode(logger, enabled=True):
     """Log demo mode status"""
@@ -100,5 +105,6 @@ default_logger = setup_logger()
 def get_logger(name=None):
     """Get logger instance"""
     if name:
-        return logging.getLogger(name)
+        # Child loggers propagate to default_logger's handlers instead of needing their own
+        return default_logger.getChild(name)
     return default_logger 
\ No newline at end of file
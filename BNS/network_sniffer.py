@@ -4,125 +4,191 @@ Basic Network Sniffer
 A comprehensive network packet analyzer with real-time monitoring capabilities.
 """
 
+import platform
 import socket
+import subprocess
+import sys
 import struct
 import textwrap
-import binascii
 import time
 import threading
-from datetime import datetime
+import functools
 from scapy.all import *
 from scapy.layers.inet import IP, TCP, UDP, ICMP
 from scapy.layers.l2 import Ether, ARP
-import json
 import queue
+import re
+from collections import deque
+from config import MAX_PACKETS_IN_MEMORY, ensure_valid
+from json_utils import dump_json
+from packet_parser import PacketInfo, format_timestamp, parse_frame
+from packet_store import PacketStore
+
+# Interface names in `ip link show` and `ifconfig` output (matched on raw bytes)
+_LINUX_IF_RE = re.compile(rb'^\d+:\s+([^:@\s]+)[:@]', re.M)
+_MAC_IF_RE = re.compile(rb'^([a-zA-Z0-9]+):\s', re.M)
+
+_SYSTEM = platform.system()
+IFACE_DETECT_TIMEOUT = 2  # seconds to wait for ipconfig / ip / ifconfig
+
+SNIFFER_START_TIMEOUT = 2  # seconds to wait for scapy to open its capture sockets
+RAW_QUEUE_SIZE = 10000  # captured packets waiting for analysis before new ones are dropped
+
+@functools.lru_cache(maxsize=1)
+def _detect_interfaces():
+    """Enumerate network interfaces using scapy or platform tools (cached per process)"""
+    try:
+        # Try scapy's get_if_list first
+        interfaces = get_if_list()
+        if interfaces:
+            return tuple(interfaces)
+    except Exception as e:
+        print(f"Scapy interface detection failed: {e}")
+    
+    # Fallback methods for different operating systems
+    if _SYSTEM == "Windows":
+        # Windows-specific interface detection
+        try:
+            result = subprocess.run(['ipconfig'], capture_output=True, text=True, timeout=IFACE_DETECT_TIMEOUT)
+            if result.returncode == 0:
+                interfaces = []
+                lines = result.stdout.split('\n')
+                current_interface = None
+                
+                for line in lines:
+                    line = line.strip()
+                    if 'adapter' in line.lower() and ':' in line:
+                        # Extract interface name
+                        interface_name = line.split(':')[0].strip()
+                        if interface_name and not any(x in interface_name.lower() for x in ['ethernet adapter', 'wireless lan adapter']):
+                            current_interface = interface_name
+                            interfaces.append(current_interface)
+                
+                if interfaces:
+                    return tuple(interfaces)
+        except Exception as e:
+            print(f"Windows interface detection failed: {e}")
+    
+    elif _SYSTEM == "Linux":
+        # Linux-specific interface detection
+        try:
+            result = subprocess.run(['ip', 'link', 'show'], capture_output=True, timeout=IFACE_DETECT_TIMEOUT)
+            if result.returncode == 0:
+                # Interface lines look like: 1: lo: <LOOPBACK,UP,LOWER_UP> ... state UNKNOWN
+                interfaces = [m.group(1).decode() for m in _LINUX_IF_RE.finditer(result.stdout)
+                              if not m.group(1).startswith(b'lo')]
+                
+                if interfaces:
+                    return tuple(interfaces)
+        except Exception as e:
+            print(f"Linux interface detection failed: {e}")
+    
+    elif _SYSTEM == "Darwin":  # macOS
+        # macOS-specific interface detection
+        try:
+            result = subprocess.run(['ifconfig'], capture_output=True, timeout=IFACE_DETECT_TIMEOUT)
+            if result.returncode == 0:
+                # Interface lines look like: en0: flags=8863<UP,BROADCAST,SMART,RUNNING,SIMPLEX,MULTICAST>
+                interfaces = [m.group(1).decode() for m in _MAC_IF_RE.finditer(result.stdout)
+                              if not m.group(1).startswith(b'lo')]
+                
+                if interfaces:
+                    return tuple(interfaces)
+        except Exception as e:
+            print(f"macOS interface detection failed: {e}")
+    
+    # Final fallback - return common interface names
+    print("⚠️  Using fallback interface list")
+    return ("eth0", "wlan0", "lo", "en0", "en1")
+
+SIOCGIFNETMASK = 0x891b  # Linux ioctl returning an interface's IPv4 netmask
+
+def _get_netmask(interface):
+    """Look up the IPv4 netmask of an interface ('N/A' if it has none)"""
+    if sys.platform.startswith('linux'):
+        import fcntl
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            ifreq = struct.pack('256s', interface.encode()[:15])
+            try:
+                return socket.inet_ntoa(fcntl.ioctl(s.fileno(), SIOCGIFNETMASK, ifreq)[20:24])
+            except OSError:
+                # EADDRNOTAVAIL for interfaces without an IPv4 address
+                return 'N/A'
+    
+    # Windows/macOS: psutil reports address and netmask together
+    try:
+        import psutil
+    except ImportError:
+        return 'N/A'
+    if _SYSTEM == "Windows":
+        # get_if_list() yields NPF device names, but psutil keys adapters by friendly name
+        try:
+            interface = conf.ifaces.dev_from_networkname(interface).name
+        except (AttributeError, ValueError):
+            pass  # old scapy, or already a friendly name from the ipconfig fallback
+    for addr in psutil.net_if_addrs().get(interface, ()):
+        if addr.family == socket.AF_INET:
+            return addr.netmask
+    return 'N/A'
+
+# Linux can read frames straight from an AF_PACKET socket and parse the
+# headers with struct, skipping scapy's per-packet object construction
+RAW_CAPTURE = sys.platform.startswith('linux') and hasattr(socket, 'AF_PACKET')
+ETH_P_ALL = 0x0003
+RAW_RECV_SIZE = 65535
+ARPHRD_ETHER = 1
+ARPHRD_LOOPBACK = 772  # Linux loopback also carries an Ethernet header
+RAW_LINK_TYPES = frozenset((ARPHRD_ETHER, ARPHRD_LOOPBACK))
+
+# <linux/if_packet.h> constants for putting an AF_PACKET socket's interface in promiscuous mode
+SOL_PACKET = 263
+PACKET_ADD_MEMBERSHIP = 1
+PACKET_DROP_MEMBERSHIP = 2
+PACKET_MR_PROMISC = 1
+
+def _promisc_mreq(interface):
+    """struct packet_mreq requesting promiscuous mode on an interface"""
+    return struct.pack('iHH8s', socket.if_nametoindex(interface), PACKET_MR_PROMISC, 0, b'')
 
 class NetworkSniffer:
     def __init__(self):
-        self.packets = []
+        self._store = PacketStore(MAX_PACKETS_IN_MEMORY)
+        self.packets = self._store.packets
         self.packet_queue = queue.Queue()
+        self._raw_packets = deque()  # captured packets waiting for the analyzer thread
+        self._raw_ready = threading.Condition()
         self.is_capturing = False
+        self.async_sniffer = None
+        self.analyzer_thread = None
         self.capture_thread = None
         self.packet_count = 0
+        self.dropped_count = 0
         self.interface = None
         self.filter = ""
+        self._iface_info_cache = {}
         
     def get_available_interfaces(self):
         """Get list of available network interfaces"""
-        try:
-            # Try scapy's get_if_list first
-            interfaces = get_if_list()
-            if interfaces:
-                return interfaces
-        except Exception as e:
-            print(f"Scapy interface detection failed: {e}")
-        
-        # Fallback methods for different operating systems
-        try:
-            import platform
-            import subprocess
-            
-            system = platform.system()
-            
-            if system == "Windows":
-                # Windows-specific interface detection
-                try:
-                    result = subprocess.run(['ipconfig'], capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        interfaces = []
-                        lines = result.stdout.split('\n')
-                        current_interface = None
-                        
-                        for line in lines:
-                            line = line.strip()
-                            if 'adapter' in line.lower() and ':' in line:
-                                # Extract interface name
-                                interface_name = line.split(':')[0].strip()
-                                if interface_name and not any(x in interface_name.lower() for x in ['ethernet adapter', 'wireless lan adapter']):
-                                    current_interface = interface_name
-                                    interfaces.append(current_interface)
-                        
-                        if interfaces:
-                            return interfaces
-                except Exception as e:
-                    print(f"Windows interface detection failed: {e}")
-            
-            elif system == "Linux":
-                # Linux-specific interface detection
-                try:
-                    result = subprocess.run(['ip', 'link', 'show'], capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        interfaces = []
-                        lines = result.stdout.split('\n')
-                        for line in lines:
-                            if ':' in line and 'state' in line:
-                                # Extract interface name (format: 1: lo: <LOOPBACK,UP,LOWER_UP>)
-                                parts = line.split(':')
-                                if len(parts) >= 2:
-                                    interface_name = parts[1].strip()
-                                    if interface_name and not interface_name.startswith('lo'):
-                                        interfaces.append(interface_name)
-                        
-                        if interfaces:
-                            return interfaces
-                except Exception as e:
-                    print(f"Linux interface detection failed: {e}")
-            
-            elif system == "Darwin":  # macOS
-                # macOS-specific interface detection
-                try:
-                    result = subprocess.run(['ifconfig'], capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        interfaces = []
-                        lines = result.stdout.split('\n')
-                        for line in lines:
-                            if ':' in line and not line.startswith('\t'):
-                                # Extract interface name (format: en0: flags=8863<UP,BROADCAST,SMART,RUNNING,SIMPLEX,MULTICAST>)
-                                interface_name = line.split(':')[0].strip()
-                                if interface_name and not interface_name.startswith('lo'):
-                                    interfaces.append(interface_name)
-                        
-                        if interfaces:
-                            return interfaces
-                except Exception as e:
-                    print(f"macOS interface detection failed: {e}")
-            
-        except Exception as e:
-            print(f"Platform-specific interface detection failed: {e}")
-        
-        # Final fallback - return common interface names
-        print("⚠️  Using fallback interface list")
-        return ["eth0", "wlan0", "lo", "en0", "en1"]
+        return list(_detect_interfaces())
+    
+    def invalidate_interface_cache(self):
+        """Forget cached interface details, e.g. after hardware changes"""
+        _detect_interfaces.cache_clear()
+        self._iface_info_cache.clear()
     
     def get_interface_info(self, interface):
         """Get detailed information about a network interface"""
+        if interface in self._iface_info_cache:
+            return self._iface_info_cache[interface]
+        
         try:
             info = {
                 'name': interface,
                 'mac': get_if_hwaddr(interface),
                 'ip': get_if_addr(interface),
-                'netmask': get_if_addr(interface)
+                'netmask': _get_netmask(interface)
             }
+            self._iface_info_cache[interface] = info
             return info
         except Exception as e:
             # Fallback for when interface info is not available
@@ -138,20 +204,95 @@ class NetworkSniffer:
         """Callback function for each captured packet"""
         if not self.is_capturing:
             return
+        
+        # Hand off to the analyzer thread so sniff() is never held up;
+        # drop rather than block when analysis falls behind
+        with self._raw_ready:
+            if len(self._raw_packets) >= RAW_QUEUE_SIZE:
+                self.dropped_count += 1
+                return
+            self._raw_packets.append(packet)
+            self._raw_ready.notify()
+    
+    def _analyzer_loop(self):
+        """Analyze queued packets until capture stops"""
+        while self.is_capturing:
+            # Take everything queued so far in one go and analyze it outside the lock
+            with self._raw_ready:
+                if not self._raw_packets:
+                    self._raw_ready.wait(timeout=0.1)
+                batch = list(self._raw_packets)
+                self._raw_packets.clear()
             
-        packet_info = self.analyze_packet(packet)
-        self.packets.append(packet_info)
+            for packet in batch:
+                try:
+                    self._store_packet(self.analyze_packet(packet))
+                except Exception as e:
+                    print(f"Packet analysis error: {e}")
+    
+    def _open_raw_socket(self, interface):
+        """Open an AF_PACKET socket for raw capture, or None if it is unavailable"""
+        # Unbound sockets mix link types from every interface, so scapy handles those
+        if not interface:
+            return None
+        try:
+            sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+            sock.bind((interface, 0))
+        except OSError as e:
+            print(f"Raw capture unavailable, using scapy: {e}")
+            return None
+        
+        # parse_frame only understands Ethernet framing; tun, WireGuard, ppp
+        # and similar links deliver bare IP packets
+        if sock.getsockname()[3] not in RAW_LINK_TYPES:
+            sock.close()
+            return None
+        
+        # Match scapy's sniff(), which puts the interface in promiscuous mode
+        if conf.sniff_promisc:
+            try:
+                sock.setsockopt(SOL_PACKET, PACKET_ADD_MEMBERSHIP, _promisc_mreq(interface))
+            except OSError as e:
+                print(f"Could not enable promiscuous mode on {interface}: {e}")
+        sock.settimeout(0.1)
+        return sock
+    
+    def _raw_capture_loop(self, sock):
+        """Read and analyze frames from an AF_PACKET socket until capture stops"""
+        buffer = bytearray(RAW_RECV_SIZE)
+        view = memoryview(buffer)
+        with sock:
+            while self.is_capturing:
+                try:
+                    size = sock.recv_into(buffer)
+                except socket.timeout:
+                    continue
+                except OSError as e:
+                    print(f"Capture error: {e}")
+                    break
+                try:
+                    self._store_packet(parse_frame(view[:size], time.time()))
+                except Exception as e:
+                    print(f"Packet analysis error: {e}")
+            
+            # The kernel also drops it on close; leaving explicitly keeps the
+            # interface's promiscuity count right while the socket lingers
+            if conf.sniff_promisc:
+                try:
+                    sock.setsockopt(SOL_PACKET, PACKET_DROP_MEMBERSHIP, _promisc_mreq(sock.getsockname()[0]))
+                except OSError:
+                    pass
+    
+    def _store_packet(self, packet_info):
+        """Store an analyzed PacketInfo and publish it to packet_queue"""
+        self._store.add(packet_info)
         self.packet_queue.put(packet_info)
         self.packet_count += 1
-        
-        # Keep only last 1000 packets in memory
-        if len(self.packets) > 1000:
-            self.packets.pop(0)
     
     def analyze_packet(self, packet):
         """Analyze a single packet and extract relevant information"""
         packet_info = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': format_timestamp(float(packet.time)),
             'length': len(packet),
             'protocol': 'Unknown',
             'src_ip': 'Unknown',
@@ -163,54 +304,64 @@ class NetworkSniffer:
             'summary': packet.summary()
         }
         
+        # Look each layer up once; getlayer returns None when it is absent
+        ip = packet.getlayer(IP)
+        arp = packet.getlayer(ARP) if ip is None else None
+        
         # Extract IP layer information
-        if IP in packet:
-            packet_info['src_ip'] = packet[IP].src
-            packet_info['dst_ip'] = packet[IP].dst
-            packet_info['protocol'] = packet[IP].proto
+        if ip is not None:
+            packet_info['src_ip'] = ip.src
+            packet_info['dst_ip'] = ip.dst
+            packet_info['protocol'] = ip.proto
+            
+            tcp = packet.getlayer(TCP)
+            udp = packet.getlayer(UDP) if tcp is None else None
             
             # TCP analysis
-            if TCP in packet:
-                packet_info['src_port'] = packet[TCP].sport
-                packet_info['dst_port'] = packet[TCP].dport
-                packet_info['flags'] = packet[TCP].flags
+            if tcp is not None:
+                packet_info['src_port'] = tcp.sport
+                packet_info['dst_port'] = tcp.dport
+                packet_info['flags'] = str(tcp.flags)  # FlagValue isn't JSON serializable
                 packet_info['protocol'] = 'TCP'
                 
                 # Extract payload (first 100 bytes)
-                if packet.haslayer(Raw):
-                    payload = packet[Raw].load
-                    packet_info['payload'] = binascii.hexlify(payload[:100]).decode()
+                raw = packet.getlayer(Raw)
+                if raw is not None:
+                    packet_info['payload'] = memoryview(raw.load)[:100].hex()
             
             # UDP analysis
-            elif UDP in packet:
-                packet_info['src_port'] = packet[UDP].sport
-                packet_info['dst_port'] = packet[UDP].dport
+            elif udp is not None:
+                packet_info['src_port'] = udp.sport
+                packet_info['dst_port'] = udp.dport
                 packet_info['protocol'] = 'UDP'
                 
-                if packet.haslayer(Raw):
-                    payload = packet[Raw].load
-                    packet_info['payload'] = binascii.hexlify(payload[:100]).decode()
+                raw = packet.getlayer(Raw)
+                if raw is not None:
+                    packet_info['payload'] = memoryview(raw.load)[:100].hex()
             
             # ICMP analysis
-            elif ICMP in packet:
-                packet_info['protocol'] = 'ICMP'
-                packet_info['icmp_type'] = packet[ICMP].type
-                packet_info['icmp_code'] = packet[ICMP].code
+            else:
+                icmp = packet.getlayer(ICMP)
+                if icmp is not None:
+                    packet_info['protocol'] = 'ICMP'
+                    packet_info['icmp_type'] = icmp.type
+                    packet_info['icmp_code'] = icmp.code
         
         # ARP analysis
-        elif ARP in packet:
+        elif arp is not None:
             packet_info['protocol'] = 'ARP'
-            packet_info['src_ip'] = packet[ARP].psrc
-            packet_info['dst_ip'] = packet[ARP].pdst
-            packet_info['src_mac'] = packet[ARP].hwsrc
-            packet_info['dst_mac'] = packet[ARP].hwdst
+            packet_info['src_ip'] = arp.psrc
+            packet_info['dst_ip'] = arp.pdst
+            packet_info['src_mac'] = arp.hwsrc
+            packet_info['dst_mac'] = arp.hwdst
         
         # Ethernet layer
-        if Ether in packet:
-            packet_info['src_mac'] = packet[Ether].src
-            packet_info['dst_mac'] = packet[Ether].dst
+        eth = packet.getlayer(Ether)
+        if eth is not None:
+            packet_info['src_mac'] = eth.src
+            packet_info['dst_mac'] = eth.dst
         
-        return packet_info
+        return PacketInfo(**packet_info)
     
     def start_capture(self, interface=None, filter_str=""):
         """Start packet capture on specified interface"""
@@ -221,80 +372,91 @@ class NetworkSniffer:
         self.filter = filter_str
         self.is_capturing = True
         self.packet_count = 0
+        self.dropped_count = 0
+        self._raw_packets.clear()  # Discard leftovers from a previous run
         
-        def capture_packets():
-            try:
-                sniff(
-                    iface=interface,
-                    prn=self.packet_callback,
-                    filter=filter_str,
-                    store=0,
-                    stop_filter=lambda x: not self.is_capturing
-                )
-            except Exception as e:
-                print(f"Capture error: {e}")
+        # BPF filters are compiled by scapy/libpcap, so filtered captures stay on scapy
+        sock = self._open_raw_socket(interface) if RAW_CAPTURE and not filter_str else None
+        if sock is not None:
+            self.capture_thread = threading.Thread(target=self._raw_capture_loop, args=(sock,), daemon=True)
+            self.capture_thread.start()
+            return True
+        
+        self.analyzer_thread = threading.Thread(target=self._analyzer_loop, daemon=True)
+        self.analyzer_thread.start()
+        
+        # AsyncSniffer runs sniff() on its own thread and can be stopped
+        # directly, so no per-packet stop_filter is needed
+        started = threading.Event()
+        try:
+            self.async_sniffer = AsyncSniffer(
+                iface=interface,
+                prn=self.packet_callback,
+                filter=filter_str,
+                store=False,
+                started_callback=started.set
+            )
+            self.async_sniffer.start()
+        except Exception as e:
+            print(f"Capture error: {e}")
+            self.is_capturing = False
+            return False
         
-        self.capture_thread = threading.Thread(target=capture_packets, daemon=True)
-        self.capture_thread.start()
+        # start() never raises: sniff errors (bad filter, no permission, bad
+        # interface) end the sniffer thread and are kept on .exception
+        thread = self.async_sniffer.thread
+        deadline = time.monotonic() + SNIFFER_START_TIMEOUT
+        while not started.wait(timeout=0.05) and thread.is_alive() and time.monotonic() < deadline:
+            pass
+        if not started.is_set() and not thread.is_alive():
+            print(f"Capture error: {getattr(self.async_sniffer, 'exception', None) or 'sniffer thread exited'}")
+            self.async_sniffer = None
+            self.is_capturing = False
+            return False
         return True
     
     def stop_capture(self):
         """Stop packet capture"""
         self.is_capturing = False
+        if self.async_sniffer:
+            try:
+                self.async_sniffer.stop()
+            except Exception as e:
+                # Raised when the sniffer already stopped, e.g. after a capture error
+                print(f"Capture stop error: {e}")
+            self.async_sniffer = None
+        if self.analyzer_thread:
+            self.analyzer_thread.join(timeout=1)
         if self.capture_thread:
             self.capture_thread.join(timeout=1)
+            self.capture_thread = None
         return True
     
     def get_packet_stats(self):
         """Get statistics about captured packets"""
-        if not self.packets:
-            return {}
-        
-        protocols = {}
-        ips = {}
-        ports = {}
-        
-        for packet in self.packets:
-            # Protocol stats
-            protocol = packet.get('protocol', 'Unknown')
-            protocols[protocol] = protocols.get(protocol, 0) + 1
-            
-            # IP stats
-            src_ip = packet.get('src_ip', 'Unknown')
-            if src_ip != 'Unknown':
-                ips[src_ip] = ips.get(src_ip, 0) + 1
-            
-            # Port stats
-            src_port = packet.get('src_port')
-            if src_port:
-                ports[src_port] = ports.get(src_port, 0) + 1
-        
-        return {
-            'total_packets': len(self.packets),
-            'protocols': protocols,
-            'top_ips': dict(sorted(ips.items(), key=lambda x: x[1], reverse=True)[:10]),
-            'top_ports': dict(sorted(ports.items(), key=lambda x: x[1], reverse=True)[:10])
-        }
+        return self._store.stats()
     
     def get_recent_packets(self, count=50):
         """Get the most recent packets"""
-        return self.packets[-count:] if self.packets else []
+        return [packet.to_dict() for packet in self._store.recent(count)]
     
     def clear_packets(self):
         """Clear all stored packets"""
-        self.packets.clear()
+        self._store.clear()
         self.packet_count = 0
     
     def export_packets(self, filename):
         """Export captured packets to a file"""
         try:
-            with open(filename, 'w') as f:
-                json.dump(self.packets, f, indent=2)
+            dump_json([packet.to_dict() for packet in self._store.snapshot()], filename)
             return True
         except Exception as e:
             print(f"Export error: {e}")
             return False
 
+# Reject bad settings before MAX_PACKETS_IN_MEMORY sizes the sniffer buffer
+ensure_valid()
+
 # Global sniffer instance
 sniffer = NetworkSniffer()
 
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Packet records and raw frame parsing for Network Sniffer
+Kept free of scapy so the header parser can run (and be tested) without it.
+"""
+
+import socket
+import struct
+from datetime import datetime
+from typing import NamedTuple, Optional, Any
+
+# Formatted date/time of the last whole second seen; only the thread analyzing the
+# current capture (analyzer or raw capture thread) writes these
+_last_ts_sec = None
+_last_ts_str = ""
+
+def format_timestamp(t):
+    """ISO-format an epoch timestamp, reusing the formatted second across calls"""
+    global _last_ts_sec, _last_ts_str
+    sec = int(t)
+    if sec != _last_ts_sec:
+        _last_ts_str = datetime.fromtimestamp(sec).isoformat()
+        _last_ts_sec = sec
+    return f"{_last_ts_str}.{int((t - sec) * 1e6):06d}"
+
+# Fields analyze_packet only fills in for some packet types
+_OPTIONAL_FIELDS = frozenset(('src_mac', 'dst_mac', 'icmp_type', 'icmp_code'))
+
+class PacketInfo(NamedTuple):
+    """An analyzed packet as stored in the sniffer buffer"""
+    timestamp: str
+    length: int
+    protocol: Any  # Name such as 'TCP', or the IP protocol number
+    src_ip: str
+    dst_ip: str
+    src_port: Optional[int] = None
+    dst_port: Optional[int] = None
+    flags: Optional[str] = None  # TCP flag letters such as 'SA'
+    payload: Optional[str] = None
+    summary: Optional[str] = None
+    src_mac: Optional[str] = None
+    dst_mac: Optional[str] = None
+    icmp_type: Optional[int] = None
+    icmp_code: Optional[int] = None
+    
+    def to_dict(self):
+        """Dict form for JSON/API consumers, without optional fields that are unset"""
+        return {key: value for key, value in self._asdict().items()
+                if value is not None or key not in _OPTIONAL_FIELDS}
+
+VLAN_ETHER_TYPES = frozenset((0x8100, 0x88a8))  # 802.1Q and 802.1ad tags
+IP_FRAGMENT_OFFSET_MASK = 0x1fff
+
+_ETH_HDR = struct.Struct('!6s6sH')
+_VLAN_HDR = struct.Struct('!2xH')
+_IPV4_HDR = struct.Struct('!BBHHHBBH4s4s')
+_ARP_HDR = struct.Struct('!HHBBH6s4s6s4s')
+_PORTS = struct.Struct('!HH')
+_TCP_OFFSET_FLAGS = struct.Struct('!12xBB')
+_ICMP_HDR = struct.Struct('!BB')
+_TCP_FLAG_LETTERS = 'FSRPAUEC'  # scapy's flag letters, lowest bit first
+
+def _mac(raw):
+    return ':'.join('%02x' % b for b in raw)
+
+def _tcp_flags(bits):
+    return ''.join(letter for i, letter in enumerate(_TCP_FLAG_LETTERS) if bits & (1 << i))
+
+def parse_frame(frame, t):
+    """Build a PacketInfo from a raw Ethernet frame, mirroring NetworkSniffer.analyze_packet"""
+    packet_info = {
+        'timestamp': format_timestamp(t),
+        'length': len(frame),
+        'protocol': 'Unknown',
+        'src_ip': 'Unknown',
+        'dst_ip': 'Unknown'
+    }
+    summary = 'Raw'
+    
+    # A truncated frame keeps whatever was decoded before the headers ran out
+    try:
+        dst_mac, src_mac, eth_type = _ETH_HDR.unpack_from(frame)
+        packet_info['src_mac'] = _mac(src_mac)
+        packet_info['dst_mac'] = _mac(dst_mac)
+        layers = summary = 'Ether'
+        offset = _ETH_HDR.size
+        
+        # Step over VLAN tags to the encapsulated EtherType
+        while eth_type in VLAN_ETHER_TYPES:
+            eth_type, = _VLAN_HDR.unpack_from(frame, offset)
+            offset += _VLAN_HDR.size
+            layers = summary = layers + ' / Dot1Q'
+        
+        if eth_type == 0x0800:  # IPv4
+            ver_ihl, _, total_len, _, flags_frag, _, proto, _, src, dst = _IPV4_HDR.unpack_from(frame, offset)
+            src_ip, dst_ip = socket.inet_ntoa(src), socket.inet_ntoa(dst)
+            packet_info['src_ip'] = src_ip
+            packet_info['dst_ip'] = dst_ip
+            packet_info['protocol'] = proto
+            ip_end = offset + total_len  # anything past this is Ethernet padding
+            offset += (ver_ihl & 0x0f) * 4
+            summary = f"{layers} / IP {src_ip} > {dst_ip}"
+            
+            # Like scapy, only the first fragment carries a transport header
+            fragment = flags_frag & IP_FRAGMENT_OFFSET_MASK
+            if fragment:
+                summary += f" frag:{fragment}"
+                proto = None
+            
+            if proto == 6:  # TCP
+                sport, dport = _PORTS.unpack_from(frame, offset)
+                data_offset, flag_bits = _TCP_OFFSET_FLAGS.unpack_from(frame, offset)
+                flags = _tcp_flags(flag_bits)
+                packet_info.update(protocol='TCP', src_port=sport, dst_port=dport, flags=flags)
+                offset += (data_offset >> 4) * 4
+                summary = f"{layers} / IP / TCP {src_ip}:{sport} > {dst_ip}:{dport} {flags}"
+            elif proto == 17:  # UDP
+                sport, dport = _PORTS.unpack_from(frame, offset)
+                packet_info.update(protocol='UDP', src_port=sport, dst_port=dport)
+                offset += 8
+                summary = f"{layers} / IP / UDP {src_ip}:{sport} > {dst_ip}:{dport}"
+            elif proto == 1:  # ICMP
+                icmp_type, icmp_code = _ICMP_HDR.unpack_from(frame, offset)
+                packet_info.update(protocol='ICMP', icmp_type=icmp_type, icmp_code=icmp_code)
+                summary = f"{layers} / IP / ICMP {src_ip} > {dst_ip} type {icmp_type}"
+            
+            # Extract payload (first 100 bytes)
+            if proto in (6, 17) and offset < ip_end:
+                packet_info['payload'] = frame[offset:min(ip_end, offset + 100)].hex()
+        
+        elif eth_type == 0x0806:  # ARP
+            psrc, pdst = _ARP_HDR.unpack_from(frame, offset)[6::2]
+            packet_info['protocol'] = 'ARP'
+            packet_info['src_ip'] = socket.inet_ntoa(psrc)
+            packet_info['dst_ip'] = socket.inet_ntoa(pdst)
+            summary = f"{layers} / ARP {packet_info['src_ip']} > {packet_info['dst_ip']}"
+    except struct.error:
+        pass
+    
+    packet_info['summary'] = summary
+    return PacketInfo(**packet_info)
\ No newline at end of file
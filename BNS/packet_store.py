@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Bounded packet buffer shared by the real and demo sniffers
+Keeps running protocol/IP/port counters in step with the packets it holds.
+"""
+
+import threading
+from collections import Counter, deque
+from itertools import islice
+
+class PacketStore:
+    """Thread-safe ring buffer of the most recent packets plus their stats counters"""
+    def __init__(self, maxlen):
+        self.packets = deque(maxlen=maxlen)
+        self.seq = 0  # Total packets ever stored, used by consumers to find new ones
+        self._lock = threading.Lock()  # Guards packets and counters across capture and reader threads
+        self._protocol_counts = Counter()
+        self._ip_counts = Counter()
+        self._port_counts = Counter()
+    
+    def __len__(self):
+        return len(self.packets)
+    
+    def add(self, packet):
+        """Store a packet, evicting (and uncounting) the oldest when full"""
+        with self._lock:
+            # Evict manually so the running counters can forget the old packet
+            if len(self.packets) == self.packets.maxlen:
+                self._update_counts(self.packets.popleft(), -1)
+            self.packets.append(packet)
+            self._update_counts(packet, 1)
+            self.seq += 1
+    
+    def _update_counts(self, packet, delta):
+        """Add (delta=1) or remove (delta=-1) a packet from the running stats counters"""
+        self._bump(self._protocol_counts, packet.protocol, delta)
+        
+        if packet.src_ip != 'Unknown':
+            self._bump(self._ip_counts, packet.src_ip, delta)
+        
+        if packet.src_port:
+            self._bump(self._port_counts, packet.src_port, delta)
+    
+    @staticmethod
+    def _bump(counter, key, delta):
+        counter[key] += delta
+        if counter[key] <= 0:
+            del counter[key]
+    
+    def stats(self):
+        """Packet statistics, or {} when the store is empty"""
+        if not self.packets:
+            return {}
+        
+        with self._lock:
+            return {
+                'total_packets': len(self.packets),
+                'protocols': dict(self._protocol_counts),
+                'top_ips': dict(self._ip_counts.most_common(10)),
+                'top_ports': dict(self._port_counts.most_common(10))
+            }
+    
+    def recent(self, count):
+        """The last count packets, oldest first"""
+        with self._lock:
+            return list(islice(self.packets, max(0, len(self.packets) - count), None))
+    
+    def since(self, seq):
+        """Packets stored after sequence number seq, plus the current sequence number"""
+        with self._lock:
+            new_count = min(self.seq - seq, len(self.packets))
+            return self.seq, list(islice(self.packets, len(self.packets) - new_count, None))
+    
+    def snapshot(self):
+        """All stored packets, oldest first"""
+        with self._lock:
+            return list(self.packets)
+    
+    def clear(self):
+        """Drop all stored packets and reset the counters"""
+        with self._lock:
+            self.packets.clear()
+            self._protocol_counts.clear()
+            self._ip_counts.clear()
+            self._port_counts.clear()
@@ -4,33 +4,36 @@ Network Sniffer Startup Script
 Provides an easy way to launch the network sniffer application.
 """
 
+# eventlet/gevent must patch the standard library before anything else imports it
+from config import apply_async_mode
+apply_async_mode()
+
 import sys
 import os
-import subprocess
-import argparse
+import time
+from types import SimpleNamespace
+import asyncio
+import importlib
+from functools import lru_cache
+from importlib.util import find_spec
 
-def check_dependencies():
-    """Check if required dependencies are installed"""
-    missing_deps = []
-    try:
-        import flask
-    except ImportError:
-        missing_deps.append("flask")
-    
-    try:
-        import scapy
-    except ImportError:
-        missing_deps.append("scapy")
-    
-    try:
-        import flask_socketio
-    except ImportError:
-        missing_deps.append("flask-socketio")
-    
-    try:
-        import rich
-    except ImportError:
-        missing_deps.append("rich")
+# Modules each launch mode needs, checked just before that mode starts
+REQUIRED = {
+    "web": ("flask", "flask_socketio", "scapy"),
+    "demo": ("flask", "flask_socketio"),
+    "cli": ("scapy", "rich"),
+    "health": (),
+}
+
+# pip package names that differ from the module name
+PACKAGE_NAMES = {"flask_socketio": "flask-socketio"}
+
+def check_dependencies(modules):
+    """Check if the given dependencies are installed"""
+    # Modules already imported need no lookup; find_spec only locates the rest
+    # (importing scapy here would cost ~1s)
+    missing_deps = [PACKAGE_NAMES.get(module, module) for module in modules
+                    if sys.modules.get(module) is None and find_spec(module) is None]
     
     if missing_deps:
         print(f"❌ Missing dependencies: {', '.join(missing_deps)}")
@@ -40,37 +43,184 @@ def check_dependencies():
         print("✅ All dependencies are installed")
         return True
 
+def require_dependencies(mode):
+    """Exit with install hints if the dependencies for a launch mode are missing"""
+    if not check_dependencies(REQUIRED[mode]):
+        print("\n💡 Tip: If you're having trouble with dependencies, try:")
+        print("   python -m pip install --upgrade pip")
+        print("   pip install -r requirements.txt")
+        sys.exit(1)
+
+# shell32's IsUserAnAdmin, resolved once with a typed signature (None off Windows)
+_IsUserAnAdmin = None
+if os.name == 'nt':
+    try:
+        import ctypes
+        _IsUserAnAdmin = ctypes.windll.shell32.IsUserAnAdmin
+        _IsUserAnAdmin.argtypes = []
+        _IsUserAnAdmin.restype = ctypes.c_bool
+    except (ImportError, AttributeError, OSError):
+        _IsUserAnAdmin = None
+
+_geteuid = getattr(os, 'geteuid', None)  # Unix only
+
+@lru_cache(maxsize=1)
 def check_permissions():
-    """Check if running with appropriate permissions"""
+    """Check if running with appropriate permissions (cached; it can't change mid-run)"""
     if os.name == 'nt':  # Windows
+        if _IsUserAnAdmin is None:
+            return False
         try:
-            import ctypes
-            return ctypes.windll.shell32.IsUserAnAdmin()
-        except:
+            return _IsUserAnAdmin()
+        except OSError:
             return False
     else:  # Unix-like
-        return os.geteuid() == 0
+        return _geteuid() == 0
 
-def print_banner():
-    """Print application banner"""
-    banner = """
+# Socket.IO launchers: mode -> (module, port, icon, display name, extra startup notes)
+LAUNCHERS = {
+    "web": ("app", 5000, "🌐", "Web Interface", ()),
+    "demo": ("demo_app", 5001, "🎭", "Demo Mode", ("This uses simulated packet data for testing",)),
+}
+
+def launch(mode):
+    """Run a web launcher's Socket.IO server until Ctrl+C; returns False if it failed"""
+    module_name, port, icon, name, notes = LAUNCHERS[mode]
+    print(f"{icon} Launching {name}...")
+    print(f"   Opening http://localhost:{port}")
+    for note in notes:
+        print(f"   {note}")
+    print("   Press Ctrl+C to stop")
+    print()
+    
+    require_dependencies(mode)
+    if find_spec(module_name) is None:
+        print(f"❌ Error: Could not import {module_name} module")
+        print(f"💡 Make sure {module_name}.py exists in the current directory")
+        return False
+    try:
+        module = importlib.import_module(module_name)
+        module.socketio.run(module.app, host='0.0.0.0', port=port, debug=False)
+    except KeyboardInterrupt:
+        print(f"\n👋 {name} stopped")
+    except Exception as e:
+        print(f"❌ Error launching {name}: {e}")
+        return False
+    return True
+
+HEALTH_REPORT_TTL = 30  # seconds a health report is reused before the checks run again
+
+@lru_cache(maxsize=1)
+def cached_health_report(bucket):
+    """Run all health checks; bucket changes every HEALTH_REPORT_TTL seconds"""
+    from health_check import HealthChecker
+    checker = HealthChecker()
+    return checker, checker.run_all_checks()
+
+def run_health_check():
+    """Print the health report and next-step advice, returning True if healthy"""
+    checker, report = cached_health_report(int(time.monotonic() // HEALTH_REPORT_TTL))
+    is_healthy = checker.print_report(report)
+    
+    if is_healthy:
+        print("\n✅ System is healthy! You can now run the application.")
+    else:
+        print("\n❌ Please resolve the issues above before running the application.")
+        print("💡 Try running in demo mode: python start.py --demo")
+    return is_healthy
+
+async def run_cli_process(argv):
+    """Run cli_sniffer.py in a child interpreter and wait for it on the event loop"""
+    process = await asyncio.create_subprocess_exec(sys.executable, 'cli_sniffer.py', *argv)
+    return await process.wait()
+
+def run_cli(argv):
+    """Run cli_sniffer.main in this process, or in a child interpreter if it can't be imported"""
+    try:
+        import cli_sniffer
+    except ImportError:
+        asyncio.run(run_cli_process(argv))
+        return
+    cli_sniffer.main(argv)
+
+async def ainput(prompt):
+    """input() for coroutines: wait for stdin on the event loop instead of a blocked call"""
+    loop = asyncio.get_running_loop()
+    ready = loop.create_future()
+    try:
+        loop.add_reader(sys.stdin.fileno(), lambda: ready.done() or ready.set_result(None))
+    except (NotImplementedError, OSError, ValueError):
+        # Windows' proactor loop and regular files can't be watched; read on a worker thread
+        return await loop.run_in_executor(None, input, prompt)
+    
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    try:
+        await ready
+    finally:
+        loop.remove_reader(sys.stdin.fileno())
+    
+    # The unbuffered raw stream reads exactly one line, leaving the rest for the next prompt
+    line = sys.stdin.buffer.raw.readline()
+    if not line:
+        raise EOFError
+    return line.decode(sys.stdin.encoding or 'utf-8').rstrip('\r\n')
+
+async def read_choice():
+    """Prompt until a valid menu choice is entered"""
+    while True:
+        choice = (await ainput("Enter your choice (1-6): ")).strip()
+        if validate_choice(choice):
+            return int(choice)
+        print("❌ Invalid choice. Please enter a number between 1-6.")
+
+_BANNER = """
     ╔══════════════════════════════════════════════════════════════╗
     ║                    NETWORK SNIFFER                           ║
     ║                Real-time Packet Analyzer                     ║
     ╚══════════════════════════════════════════════════════════════╝
     """
-    print(banner)
+
+def print_banner():
+    """Print application banner"""
+    print(_BANNER)
+
+MENU = (
+    "🎯 Choose your interface:\n"
+    "   1. Web Interface (Recommended)\n"
+    "   2. Demo Mode (Simulated Data)\n"
+    "   3. Command Line Interface\n"
+    "   4. List Network Interfaces\n"
+    "   5. Health Check & Diagnostics\n"
+    "   6. Exit\n"
+    "\n"
+)
+
+_VALID_CHOICES = frozenset("123456")
 
 def validate_choice(choice):
     """Validate user input choice"""
-    try:
-        choice_num = int(choice)
-        return 1 <= choice_num <= 6
-    except ValueError:
-        return False
+    return len(choice) == 1 and choice in _VALID_CHOICES
 
-def main():
-    """Main function"""
+# Launches common enough to skip building the argparse parser
+_FAST_ARGS = {
+    (): {},
+    ('--web',): {'web': True},
+    ('--demo',): {'demo': True},
+    ('--health-check',): {'health_check': True},
+    ('--cli', '--list'): {'cli': True, 'list': True},
+    ('--cli', '-l'): {'cli': True, 'list': True},
+}
+
+def parse_args(argv):
+    """Parse command line arguments, importing argparse only for uncommon invocations"""
+    fast = _FAST_ARGS.get(tuple(argv))
+    if fast is not None:
+        args = dict(web=False, cli=False, list=False, interface=None, filter='', demo=False, health_check=False)
+        args.update(fast)
+        return SimpleNamespace(**args)
+    
+    import argparse
     parser = argparse.ArgumentParser(
         description="Network Sniffer - Choose your interface",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -127,7 +277,11 @@ Examples:
         help='Run system health check and diagnostics'
     )
     
-    args = parser.parse_args()
+    return parser.parse_args(argv)
+
+def main():
+    """Main function"""
+    args = parse_args(sys.argv[1:])
     
     # Print banner
     print_banner()
@@ -136,34 +290,18 @@ Examples:
     if args.health_check:
         print("🔍 Running Health Check...")
         print()
-        try:
-            from health_check import HealthChecker
-            checker = HealthChecker()
-            report = checker.run_all_checks()
-            is_healthy = checker.print_report(report)
-            
-            if is_healthy:
-                print("\n✅ System is healthy! You can now run the application.")
-            else:
-                print("\n❌ Please resolve the issues above before running the application.")
-                print("💡 Try running in demo mode: python start.py --demo")
-            
-            sys.exit(0 if is_healthy else 1)
-        except ImportError:
+        require_dependencies("health")
+        if find_spec("health_check") is None:
             print("❌ Health check module not available")
             print("💡 Make sure health_check.py exists in the current directory")
             sys.exit(1)
+        try:
+            is_healthy = run_health_check()
+            sys.exit(0 if is_healthy else 1)
         except Exception as e:
             print(f"❌ Error running health check: {e}")
             sys.exit(1)
     
-    # Check dependencies
-    if not check_dependencies():
-        print("\n💡 Tip: If you're having trouble with dependencies, try:")
-        print("   python -m pip install --upgrade pip")
-        print("   pip install -r requirements.txt")
-        sys.exit(1)
-    
     # Check permissions
     if not check_permissions():
         print("⚠️  Warning: This application requires administrator/root privileges")
@@ -173,60 +311,43 @@ Examples:
         print("   💡 Demo mode doesn't require privileges!")
         print()
     
+    # Validate configuration (errors are printed by ensure_valid)
+    try:
+        from config import ensure_valid
+        ensure_valid()
+    except ValueError:
+        sys.exit(1)
+    
     # Determine which interface to launch
     if args.demo:
-        print("🎭 Launching Demo Mode...")
-        print("   Opening http://localhost:5001")
-        print("   This uses simulated packet data for testing")
-        print("   Press Ctrl+C to stop")
-        print()
-        
-        try:
-            from demo_app import app, socketio
-            socketio.run(app, host='0.0.0.0', port=5001, debug=False)
-        except KeyboardInterrupt:
-            print("\n👋 Demo interface stopped")
-        except Exception as e:
-            print(f"❌ Error launching demo interface: {e}")
-            print("💡 Make sure demo_app.py exists in the current directory")
+        if not launch("demo"):
             sys.exit(1)
     
     elif args.web:
-        print("🌐 Launching Web Interface...")
-        print("   Opening http://localhost:5000")
-        print("   Press Ctrl+C to stop")
-        print()
-        
-        try:
-            from app import app, socketio
-            socketio.run(app, host='0.0.0.0', port=5000, debug=False)
-        except KeyboardInterrupt:
-            print("\n👋 Web interface stopped")
-        except Exception as e:
-            print(f"❌ Error launching web interface: {e}")
-            print("💡 Make sure app.py exists in the current directory")
+        if not launch("web"):
             sys.exit(1)
     
     elif args.cli:
         print("💻 Launching Command Line Interface...")
         print()
         
-        # Build CLI command
-        cmd = [sys.executable, 'cli_sniffer.py']
+        # Build CLI arguments
+        cli_args = []
         
         if args.list:
-            cmd.append('--list')
+            cli_args.append('--list')
         elif args.interface:
-            cmd.extend(['--interface', args.interface])
+            cli_args.extend(['--interface', args.interface])
             if args.filter:
-                cmd.extend(['--filter', args.filter])
+                cli_args.extend(['--filter', args.filter])
         else:
             print("❌ Error: CLI mode requires --list or --interface")
             print("   Use --help for more information")
             sys.exit(1)
         
+        require_dependencies("cli")
         try:
-            subprocess.run(cmd)
+            run_cli(cli_args)
         except KeyboardInterrupt:
             print("\n👋 CLI stopped")
         except Exception as e:
@@ -236,60 +357,22 @@ Examples:
     
     else:
         # Interactive mode
-        print("🎯 Choose your interface:")
-        print("   1. Web Interface (Recommended)")
-        print("   2. Demo Mode (Simulated Data)")
-        print("   3. Command Line Interface")
-        print("   4. List Network Interfaces")
-        print("   5. Health Check & Diagnostics")
-        print("   6. Exit")
-        print()
+        sys.stdout.write(MENU)
+        sys.stdout.flush()
         
         while True:
             try:
-                choice = input("Enter your choice (1-6): ").strip()
-                
-                if not validate_choice(choice):
-                    print("❌ Invalid choice. Please enter a number between 1-6.")
-                    continue
-                
-                choice_num = int(choice)
+                # The prompt waits on an event loop; launches below stay synchronous
+                choice_num = asyncio.run(read_choice())
                 
                 if choice_num == 1:
-                    print("\n🌐 Launching Web Interface...")
-                    print("   Opening http://localhost:5000")
-                    print("   Press Ctrl+C to stop")
                     print()
-                    
-                    try:
-                        from app import app, socketio
-                        socketio.run(app, host='0.0.0.0', port=5000, debug=False)
-                    except KeyboardInterrupt:
-                        print("\n👋 Web interface stopped")
-                    except ImportError:
-                        print("❌ Error: Could not import app module")
-                        print("💡 Make sure app.py exists in the current directory")
-                    except Exception as e:
-                        print(f"❌ Error launching web interface: {e}")
+                    launch("web")
                     break
                 
                 elif choice_num == 2:
-                    print("\n🎭 Launching Demo Mode...")
-                    print("   Opening http://localhost:5001")
-                    print("   This uses simulated packet data for testing")
-                    print("   Press Ctrl+C to stop")
                     print()
-                    
-                    try:
-                        from demo_app import app, socketio
-                        socketio.run(app, host='0.0.0.0', port=5001, debug=False)
-                    except KeyboardInterrupt:
-                        print("\n👋 Demo interface stopped")
-                    except ImportError:
-                        print("❌ Error: Could not import demo_app module")
-                        print("💡 Make sure demo_app.py exists in the current directory")
-                    except Exception as e:
-                        print(f"❌ Error launching demo interface: {e}")
+                    launch("demo")
                     break
                 
                 elif choice_num == 3:
@@ -302,8 +385,11 @@ Examples:
                 
                 elif choice_num == 4:
                     print("\n📋 Listing Network Interfaces...")
+                    require_dependencies("cli")
                     try:
-                        subprocess.run([sys.executable, 'cli_sniffer.py', '--list'])
+                        run_cli(['--list'])
+                    except SystemExit:
+                        pass  # cli_sniffer already reported why listing failed
                     except FileNotFoundError:
                         print("❌ Error: cli_sniffer.py not found")
                         print("💡 Make sure cli_sniffer.py exists in the current directory")
@@ -314,22 +400,15 @@ Examples:
                 elif choice_num == 5:
                     print("\n🔍 Running Health Check & Diagnostics...")
                     print()
-                    try:
-                        from health_check import HealthChecker
-                        checker = HealthChecker()
-                        report = checker.run_all_checks()
-                        is_healthy = checker.print_report(report)
-                        
-                        if is_healthy:
-                            print("\n✅ System is healthy! You can now run the application.")
-                        else:
-                            print("\n❌ Please resolve the issues above before running the application.")
-                            print("💡 Try running in demo mode: python start.py --demo")
-                    except ImportError:
+                    require_dependencies("health")
+                    if find_spec("health_check") is None:
                         print("❌ Health check module not available")
                         print("💡 Make sure health_check.py exists in the current directory")
-                    except Exception as e:
-                        print(f"❌ Error running health check: {e}")
+                    else:
+                        try:
+                            run_health_check()
+                        except Exception as e:
+                            print(f"❌ Error running health check: {e}")
                     print()
                 
                 elif choice_num == 6:
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Frame-level checks for packet_parser.parse_frame
+Run with: python -m unittest test_packet_parser
+"""
+
+import socket
+import struct
+import unittest
+
+from packet_parser import parse_frame
+
+SRC_MAC = b'\xbb' * 6
+DST_MAC = b'\xaa' * 6
+SRC_IP = '10.0.0.1'
+DST_IP = '10.0.0.2'
+
+def ether(eth_type, payload, vlan_ids=()):
+    """Ethernet header, optional 802.1Q tags, then payload"""
+    header = DST_MAC + SRC_MAC
+    for vlan_id in vlan_ids:
+        header += struct.pack('!HH', 0x8100, vlan_id)
+    return header + struct.pack('!H', eth_type) + payload
+
+def ipv4(proto, payload, frag=0):
+    """Minimal 20-byte IPv4 header around payload"""
+    return struct.pack('!BBHHHBBH4s4s', 0x45, 0, 20 + len(payload), 0, frag, 64, proto, 0,
+                       socket.inet_aton(SRC_IP), socket.inet_aton(DST_IP)) + payload
+
+def tcp(sport, dport, flags, payload=b''):
+    return struct.pack('!HHIIBBHHH', sport, dport, 0, 0, 5 << 4, flags, 0, 0, 0) + payload
+
+def udp(sport, dport, payload=b''):
+    return struct.pack('!HHHH', sport, dport, 8 + len(payload), 0) + payload
+
+class ParseFrameTest(unittest.TestCase):
+    def test_tcp(self):
+        frame = ether(0x0800, ipv4(6, tcp(443, 51234, 0x12, b'hello'))) + b'\x00' * 6
+        info = parse_frame(memoryview(frame), 1.5)
+        self.assertEqual(info.protocol, 'TCP')
+        self.assertEqual((info.src_ip, info.dst_ip), (SRC_IP, DST_IP))
+        self.assertEqual((info.src_port, info.dst_port), (443, 51234))
+        self.assertEqual(info.flags, 'SA')
+        self.assertEqual(info.payload, b'hello'.hex())  # Ethernet padding excluded
+        self.assertEqual(info.src_mac, 'bb:bb:bb:bb:bb:bb')
+        self.assertEqual(info.length, len(frame))
+    
+    def test_udp(self):
+        info = parse_frame(ether(0x0800, ipv4(17, udp(53, 5353, b'dns'))), 0.0)
+        self.assertEqual(info.protocol, 'UDP')
+        self.assertEqual((info.src_port, info.dst_port), (53, 5353))
+        self.assertEqual(info.payload, b'dns'.hex())
+    
+    def test_vlan_tagged_udp(self):
+        info = parse_frame(ether(0x0800, ipv4(17, udp(53, 5353)), vlan_ids=(10, 20)), 0.0)
+        self.assertEqual(info.protocol, 'UDP')
+        self.assertEqual((info.src_port, info.dst_port), (53, 5353))
+        self.assertTrue(info.summary.startswith('Ether / Dot1Q / Dot1Q / IP / UDP'))
+    
+    def test_arp(self):
+        arp = struct.pack('!HHBBH6s4s6s4s', 1, 0x0800, 6, 4, 1, SRC_MAC, socket.inet_aton(SRC_IP),
+                          b'\x00' * 6, socket.inet_aton(DST_IP))
+        info = parse_frame(ether(0x0806, arp), 0.0)
+        self.assertEqual(info.protocol, 'ARP')
+        self.assertEqual((info.src_ip, info.dst_ip), (SRC_IP, DST_IP))
+    
+    def test_non_first_fragment_has_no_ports(self):
+        info = parse_frame(ether(0x0800, ipv4(17, b'\x12\x34\x56\x78' * 4, frag=185)), 0.0)
+        self.assertEqual(info.protocol, 17)
+        self.assertIsNone(info.src_port)
+        self.assertIsNone(info.dst_port)
+        self.assertIsNone(info.payload)
+        self.assertIn('frag:185', info.summary)
+    
+    def test_first_fragment_keeps_ports(self):
+        more_fragments = 0x2000
+        info = parse_frame(ether(0x0800, ipv4(17, udp(53, 5353), frag=more_fragments)), 0.0)
+        self.assertEqual((info.protocol, info.src_port), ('UDP', 53))
+    
+    def test_truncated_frames(self):
+        full = ether(0x0800, ipv4(6, tcp(443, 51234, 0x02)))
+        for size in (0, 6, 14, 20, 34, 38):
+            info = parse_frame(memoryview(full)[:size], 0.0)
+            self.assertEqual(info.length, size)
+            self.assertIsNone(info.src_port)
+        self.assertEqual(parse_frame(full[:6], 0.0).summary, 'Raw')
+        self.assertEqual(parse_frame(full[:20], 0.0).src_ip, 'Unknown')
+        self.assertEqual(parse_frame(full[:38], 0.0).src_ip, SRC_IP)
+
+if __name__ == "__main__":
+    unittest.main()
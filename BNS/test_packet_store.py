@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Eviction and counter checks for packet_store.PacketStore
+Run with: python -m unittest test_packet_store
+"""
+
+import unittest
+
+from packet_parser import PacketInfo
+from packet_store import PacketStore
+
+def packet(protocol='TCP', src_ip='10.0.0.1', src_port=1234):
+    return PacketInfo(timestamp='', length=60, protocol=protocol, src_ip=src_ip,
+                      dst_ip='10.0.0.2', src_port=src_port)
+
+class PacketStoreTest(unittest.TestCase):
+    def test_eviction_uncounts_oldest(self):
+        store = PacketStore(2)
+        store.add(packet('UDP', '10.0.0.9', 53))
+        store.add(packet())
+        store.add(packet())
+        stats = store.stats()
+        self.assertEqual(stats['total_packets'], 2)
+        self.assertEqual(stats['protocols'], {'TCP': 2})
+        self.assertEqual(stats['top_ips'], {'10.0.0.1': 2})
+        self.assertEqual(stats['top_ports'], {1234: 2})
+    
+    def test_unknown_ip_and_missing_port_not_counted(self):
+        store = PacketStore(5)
+        store.add(packet('ARP', 'Unknown', None))
+        stats = store.stats()
+        self.assertEqual(stats['protocols'], {'ARP': 1})
+        self.assertEqual(stats['top_ips'], {})
+        self.assertEqual(stats['top_ports'], {})
+    
+    def test_since_and_recent(self):
+        store = PacketStore(3)
+        for port in range(5):
+            store.add(packet(src_port=port + 1))
+        seq, batch = store.since(3)
+        self.assertEqual(seq, 5)
+        self.assertEqual([p.src_port for p in batch], [4, 5])
+        self.assertEqual([p.src_port for p in store.since(0)[1]], [3, 4, 5])
+        self.assertEqual([p.src_port for p in store.recent(2)], [4, 5])
+    
+    def test_clear(self):
+        store = PacketStore(3)
+        store.add(packet())
+        store.clear()
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.stats(), {})
+
+if __name__ == "__main__":
+    unittest.main()